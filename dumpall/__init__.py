@@ -3,6 +3,7 @@
 
 import os
 import asyncio
+import logging
 import importlib
 import traceback
 import click
@@ -71,6 +72,12 @@ def main(
     """
     banner()
 
+    # 统一配置日志，非调试模式下只输出警告及以上
+    logging.basicConfig(
+        level=logging.DEBUG if debug else logging.WARNING,
+        format="[%(levelname)s] %(message)s",
+    )
+
     # 如果没有URL参数则要求输入
     if not url or "//" not in url:
         url = click.prompt("请输入目标URL，必须包含http://或https://\n >>")
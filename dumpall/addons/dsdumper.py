@@ -5,14 +5,33 @@
 递归解析 .DS_Store 并下载文件，同时改进性能和扩展功能。
 """
 
+import os
 import re
+import posixpath
 import asyncio
 import logging
-from urllib.parse import urlparse
+import aiohttp
+import aiofiles
+from urllib.parse import urlparse, urlsplit, urlunsplit, unquote
 from asyncio.queues import Queue
 from ..thirdparty import dsstore
 from ..dumper import BaseDumper
 
+log = logging.getLogger(__name__)
+
+_DS_STORE_SUFFIX = re.compile(r"/\.DS_Store.*")
+
+# .DS_Store 中记录目录自身或上级目录设置的特殊文件名
+_SKIP_FILENAMES = {"", ".", ".."}
+
+
+def _normalize_url(url: str) -> str:
+    """ 规范化 URL 路径（折叠 . 和 ..），作为去重的键 """
+    parts = urlsplit(url)
+    if not parts.path:
+        return url
+    return urlunsplit(parts._replace(path=posixpath.normpath(parts.path)))
+
 
 class Dumper(BaseDumper):
     """ .DS_Store 文件解析与文件下载器 """
@@ -27,25 +46,40 @@ class Dumper(BaseDumper):
             kwargs: 额外参数。
         """
         super(Dumper, self).__init__(url, outdir, **kwargs)
-        self.base_url = re.sub(r"/\.DS_Store.*", "", url)  # 去掉 .DS_Store 部分的路径
-        self.url_queue = Queue()
-        self.processed_urls = set()  # 新增：用于避免重复处理 URL
+        self.base_url = _DS_STORE_SUFFIX.sub("", url)  # 去掉 .DS_Store 部分的路径
+        self.concurrency = int(kwargs.get("concurrency", 32))  # 协程数量
+        self.seen_urls = set()  # 已入队的 URL，入队前去重
+        self.processed_urls = set()  # 已解析的 URL
         self.failed_urls = []  # 新增：记录失败的 URL
-        self.logger = logging.getLogger(__name__)  # 新增：记录日志
 
     async def start(self):
         """
         入口方法：启动递归解析与下载。
         """
+        # queue/semaphore 必须在事件循环内创建
+        self.url_queue = Queue()
+        self.sem = asyncio.Semaphore(self.concurrency)  # 限制并发下载数
+        # 所有请求共用一个 session，复用 keep-alive 连接
+        # 不限制总时长，避免大文件分块下载中途超时；连接和单次读取仍有超时
+        self._session = aiohttp.ClientSession(
+            connector=self.make_connector(
+                limit=64, ttl_dns_cache=300, keepalive_timeout=30
+            ),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30),
+        )
+        self.seen_urls.add(_normalize_url(self.base_url))
         await self.url_queue.put(self.base_url)
-        self.logger.info("启动解析任务队列...")
+        log.info("启动解析任务队列...")
 
-        # 解析 .DS_Store 文件并存储目标 URL
-        await self.parse_loop()
+        try:
+            # 解析 .DS_Store 文件并存储目标 URL
+            await self.parse_loop()
 
-        # 下载目标文件
-        self.logger.info("开始下载文件...")
-        await self.dump()
+            # 下载目标文件
+            log.info("开始下载文件...")
+            await self.dump()
+        finally:
+            await self._session.close()
 
     async def dump(self):
         """
@@ -53,67 +87,124 @@ class Dumper(BaseDumper):
         """
         task_pool = []
         for target in self.targets:
-            task_pool.append(asyncio.create_task(self.download(target)))
+            task_pool.append(asyncio.create_task(self._bounded_download(target)))
 
         # 等待所有任务完成
         for t in task_pool:
             await t
 
-        self.logger.info("所有文件已下载完成。")
+        log.info("所有文件已下载完成。")
 
-    async def parse_loop(self):
+    async def _bounded_download(self, target):
         """
-        解析队列中的 URL，递归解析 .DS_Store 文件并获取文件路径。
+        在信号量限制下下载目标文件。
+
+        Args:
+            target (tuple): 包括 URL 和文件路径。
         """
-        while not self.url_queue.empty():
-            base_url = await self.url_queue.get()
-            if base_url in self.processed_urls:  # 避免重复处理 URL
-                continue
+        async with self.sem:
+            await self.download(target)
 
-            self.processed_urls.add(base_url)
-            self.logger.info(f"正在解析 URL: {base_url}")
+    async def parse_loop(self):
+        """
+        启动协程池并发解析队列中的 URL，直到队列中所有 URL 处理完毕。
+        """
+        workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
 
-            # 尝试获取并解析 .DS_Store 文件
-            status, ds_data = await self.fetch(base_url + "/.DS_Store")
-            if status != 200 or not ds_data:
-                self.logger.warning(f"无法获取 .DS_Store 文件: {base_url}")
-                self.failed_urls.append(base_url)
-                continue
+        # 所有 URL（包括解析过程中新加入的）处理完后再结束协程池
+        await self.url_queue.join()
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
 
+    async def _worker(self):
+        """
+        解析协程：不断从队列中取出 URL 并解析。
+        """
+        while True:
+            base_url = await self.url_queue.get()
             try:
-                # 解析 .DS_Store 文件
-                ds = dsstore.DS_Store(ds_data)
-                for filename in set(ds.traverse_root()):
-                    new_url = f"{base_url}/{filename}"
-                    if new_url not in self.processed_urls:
-                        await self.url_queue.put(new_url)
-
-                    # 格式化文件路径
-                    fullname = urlparse(new_url).path.lstrip("/")
-                    self.targets.append((new_url, fullname))
-                    self.logger.info(f"发现目标文件: {fullname}")
+                await self.parse(base_url)
             except Exception as e:
-                self.logger.error(f"解析 .DS_Store 文件失败: {base_url} - {str(e)}")
+                log.error("解析 URL 失败: %s - %s", base_url, e)
                 self.failed_urls.append(base_url)
+            finally:
+                self.url_queue.task_done()
 
-    async def fetch(self, url):
+    async def parse(self, base_url):
+        """
+        获取并解析 base_url 下的 .DS_Store 文件，将发现的文件加入队列和目标列表。
+
+        Args:
+            base_url (str): 待解析的目录 URL。
+        """
+        log.info("正在解析 URL: %s", base_url)
+
+        # 尝试获取并解析 .DS_Store 文件
+        status, ds_data = await self.fetch(base_url + "/.DS_Store")
+        self.processed_urls.add(base_url)
+        if status == 404:
+            # 普通文件也会作为目录尝试解析，404 属于正常情况
+            log.debug("不存在 .DS_Store 文件: %s", base_url)
+            return
+        if status != 200 or not ds_data:
+            log.warning("无法获取 .DS_Store 文件 [%s]: %s", status, base_url)
+            self.failed_urls.append(base_url)
+            return
+
+        new_urls = []
+        new_targets = []
+        try:
+            # 解析 .DS_Store 文件
+            ds = dsstore.DS_Store(ds_data)
+            for filename in ds.traverse_root():
+                if filename in _SKIP_FILENAMES:
+                    continue
+                new_url = f"{base_url}/{filename}"
+                # 入队前按规范化后的 URL 去重，同一 URL 只入队和下载一次
+                url_key = _normalize_url(new_url)
+                if url_key in self.seen_urls:
+                    continue
+                self.seen_urls.add(url_key)
+
+                # 格式化文件路径，文件名由服务端控制，需检查是否超出下载目录
+                fullname = unquote(urlparse(new_url).path.lstrip("/"))
+                if not self.force and not await self.checkit(new_url, fullname):
+                    log.warning("跳过超出下载目录的文件: %s", fullname)
+                    continue
+                new_urls.append(new_url)
+                new_targets.append((new_url, fullname))
+                log.info("发现目标文件: %s", fullname)
+        except Exception as e:
+            log.error("解析 .DS_Store 文件失败: %s - %s", base_url, e)
+            self.failed_urls.append(base_url)
+        finally:
+            # 每个目录批量提交一次；队列无上限，put_nowait 不会阻塞
+            self.targets.extend(new_targets)
+            for new_url in new_urls:
+                self.url_queue.put_nowait(new_url)
+
+    async def fetch(self, url, times=3):
         """
-        模拟请求获取文件内容。
+        通过共享 session 获取文件内容，如果失败默认重试三次。
 
         Args:
             url (str): 目标 URL。
+            times (int): 剩余重试次数。
 
         Returns:
             tuple: 状态码和内容数据。
         """
-        self.logger.info(f"正在请求 URL: {url}")
+        log.info("正在请求 URL: %s", url)
         try:
-            # 模拟异步请求
-            # 示例伪代码：status, content = await http_get(url)
-            status, content = 200, b""  # 假设成功返回
-            return status, content
+            async with self._session.get(url, headers=self.headers) as resp:
+                return resp.status, await resp.read()
         except Exception as e:
-            self.logger.error(f"请求失败: {url} - {str(e)}")
+            if times > 0:
+                return await self.fetch(url, times - 1)
+            log.error("请求失败: %s - %s", url, e)
             return 0, None
 
     async def download(self, target):
@@ -124,24 +215,31 @@ class Dumper(BaseDumper):
             target (tuple): 包括 URL 和文件路径。
         """
         url, fullname = target
-        self.logger.info(f"开始下载文件: {fullname} 来自 {url}")
+        log.info("开始下载文件: %s 来自 %s", fullname, url)
+        path = os.path.join(self.outdir, fullname)
 
         try:
-            # 示例伪代码：status, data = await http_get(url)
-            status, data = 200, b""  # 假设成功返回
-            if status == 200:
-                with open(f"{self.outdir}/{fullname}", "wb") as f:
-                    f.write(data)
-                self.logger.info(f"文件已下载: {fullname}")
-            else:
-                self.logger.warning(f"文件下载失败: {fullname}")
-                self.failed_urls.append(url)
+            async with self._session.get(url, headers=self.headers) as resp:
+                if resp.status == 200:
+                    self.makedirs(fullname=path)
+                    # 分块写入，内存占用与文件大小无关
+                    async with aiofiles.open(path, "wb") as f:
+                        async for chunk in resp.content.iter_chunked(64 * 1024):
+                            await f.write(chunk)
+                    log.info("文件已下载: %s", fullname)
+                else:
+                    log.warning("文件下载失败: %s", fullname)
+                    self.failed_urls.append(url)
+        except IsADirectoryError:
+            # 目录本身也会作为目标下载，属于正常情况
+            pass
         except Exception as e:
-            self.logger.error(f"下载失败: {fullname} - {str(e)}")
+            log.error("下载失败: %s - %s", fullname, e)
             self.failed_urls.append(url)
 
 
 if __name__ == "__main__":
     # 测试示例
+    logging.basicConfig(level=logging.DEBUG)
     dumper = Dumper("http://example.com/.DS_Store", "./output", debug=True)
     asyncio.run(dumper.start())
@@ -49,10 +49,14 @@ class BaseDumper(object):
 
     @property
     def connector(self):
+        return self.make_connector()
+
+    def make_connector(self, **kwargs):
+        """ 创建连接器，kwargs透传给TCPConnector（如连接池参数） """
         if self.proxy:
             try:
                 _connector = ProxyConnector.from_url(
-                    self.proxy, verify_ssl=False, rdns=True
+                    self.proxy, verify_ssl=False, rdns=True, **kwargs
                 )
             except Exception as e:
                 msg = (
@@ -62,7 +66,9 @@ class BaseDumper(object):
                 self.error_log(msg=msg, e=e)
                 exit(-1)
         else:
-            _connector = aiohttp.TCPConnector(verify_ssl=False)  # 默认禁用证书验证
+            _connector = aiohttp.TCPConnector(
+                verify_ssl=False, **kwargs
+            )  # 默认禁用证书验证
         return _connector
 
     def convert(self, data: bytes) -> bytes:
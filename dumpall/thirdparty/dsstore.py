@@ -2,27 +2,16 @@ import struct
 import logging
 
 
-class ParsingError(Exception):
-    """Custom exception for errors encountered during parsing."""
-    pass
-
-
-class Logger:
-    """
-    Simple logging utility for debugging.
-    """
-    def __init__(self, enable_debug=False):
-        self.enable_debug = enable_debug
+log = logging.getLogger(__name__)
 
-    def debug(self, message):
-        if self.enable_debug:
-            print(f"[DEBUG] {message}")
+_U32 = struct.Struct(">I")
+_FILENAME_TAIL = struct.Struct(">I4s")  # structure id, structure type
+_SKIP_LENGTHS = {b"bool": 1, b"long": 4}  # Fixed-size record values
 
-    def info(self, message):
-        print(f"[INFO] {message}")
 
-    def error(self, message):
-        print(f"[ERROR] {message}")
+class ParsingError(Exception):
+    """Custom exception for errors encountered during parsing."""
+    pass
 
 
 class DataBlock:
@@ -31,17 +20,16 @@ class DataBlock:
     Provides methods for reading and manipulating the data within the block.
     """
 
-    def __init__(self, data, debug=False):
+    def __init__(self, data):
         """
         Initialize the DataBlock with raw binary data.
 
         Args:
-            data (bytes): Raw binary data of the block.
-            debug (bool): Enable or disable debugging.
+            data (bytes | memoryview): Raw binary data of the block.
         """
-        self.data = data
+        # Sub-blocks share the parent's buffer instead of copying it
+        self.data = memoryview(data)
         self.pos = 0
-        self.logger = Logger(debug)
 
     def offset_read(self, length, offset=None):
         """
@@ -52,7 +40,7 @@ class DataBlock:
             offset (int, optional): Starting offset to read from. Defaults to None.
 
         Returns:
-            bytes: The read data.
+            memoryview: A view over the read data.
 
         Raises:
             ParsingError: If the requested length exceeds the data size.
@@ -66,7 +54,13 @@ class DataBlock:
             self.pos += length
 
         value = self.data[offset_position:offset_position + length]
-        self.logger.debug(f"Reading bytes {offset_position}-{offset_position + length}: {value}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "Reading bytes %d-%d: %s",
+                offset_position,
+                offset_position + length,
+                bytes(value),
+            )
         return value
 
     def skip(self, length):
@@ -77,73 +71,7 @@ class DataBlock:
             length (int): Number of bytes to skip.
         """
         self.pos += length
-        self.logger.debug(f"Skipped {length} bytes, new position: {self.pos}")
-
-    def read_string(self, length):
-        """
-        Reads a UTF-16 encoded string from the data.
-
-        Args:
-            length (int): Length of the string in characters.
-
-        Returns:
-            str: The decoded string.
-        """
-        raw_data = self.offset_read(length * 2)
-        decoded_string = raw_data.decode("utf-16be")
-        self.logger.debug(f"Read string: {decoded_string}")
-        return decoded_string
-
-    def read_structure_type(self):
-        """
-        Reads the structure type (4-character code) from the current position.
-
-        Returns:
-            str: The structure type.
-        """
-        structure_type = self.offset_read(4).decode()
-        self.logger.debug(f"Structure type: {structure_type}")
-        return structure_type
-
-    def read_filename(self):
-        """
-        Reads and parses a filename block.
-
-        Returns:
-            str: The extracted filename.
-        """
-        length = struct.unpack(">I", self.offset_read(4))[0]
-        filename = self.read_string(length)
-        structure_id = struct.unpack(">I", self.offset_read(4))[0]
-        structure_type = self.read_structure_type()
-
-        self.logger.debug(f"Filename: {filename}, Structure ID: {structure_id}, Type: {structure_type}")
-        self.skip(self._calculate_skip_length(structure_type))
-
-        return filename
-
-    def _calculate_skip_length(self, structure_type):
-        """
-        Calculates the number of bytes to skip based on the structure type.
-
-        Args:
-            structure_type (str): The structure type.
-
-        Returns:
-            int: Number of bytes to skip.
-        """
-        skip_mapping = {
-            "bool": 1,
-            "long": 4,
-            "blob": lambda: struct.unpack(">I", self.offset_read(4))[0],
-        }
-
-        if structure_type in skip_mapping:
-            skip = skip_mapping[structure_type]
-            return skip() if callable(skip) else skip
-
-        self.logger.debug(f"Unknown structure type: {structure_type}. Defaulting to 0 skip.")
-        return 0
+        log.debug("Skipped %d bytes, new position: %d", length, self.pos)
 
 
 class DS_Store:
@@ -152,17 +80,15 @@ class DS_Store:
     Handles the parsing of headers, offsets, table of contents (ToC), and file metadata.
     """
 
-    def __init__(self, data, debug=False):
+    def __init__(self, data):
         """
         Initializes the DS_Store parser.
 
         Args:
             data (bytes): Raw binary data of the .DS_Store file.
-            debug (bool): Enable or disable debugging.
         """
         self.data = data
-        self.logger = Logger(debug)
-        self.block = DataBlock(data, debug=debug)
+        self.block = DataBlock(data)
 
         self.header = self._read_header()
         self.offsets = self._read_offsets()
@@ -187,8 +113,8 @@ class DS_Store:
             raise ParsingError("Header offset mismatch.")
 
         self.block.skip(16)
-        self.logger.info("Header parsed successfully.")
-        return DataBlock(self.block.offset_read(size, offset + 4), debug=self.logger.enable_debug)
+        log.info("Header parsed successfully.")
+        return DataBlock(self.block.offset_read(size, offset + 4))
 
     def _read_offsets(self):
         """
@@ -197,11 +123,11 @@ class DS_Store:
         Returns:
             list: List of offsets.
         """
-        count = struct.unpack(">I", self.block.offset_read(4))[0]
+        count = _U32.unpack(self.block.offset_read(4))[0]
         self.block.skip(4)  # Always zero
 
-        offsets = [struct.unpack(">I", self.block.offset_read(4))[0] for _ in range(count)]
-        self.logger.info(f"Offsets read: {offsets}")
+        offsets = list(struct.unpack(f">{count}I", self.block.offset_read(4 * count)))
+        log.info("Offsets read: %s", offsets)
         return offsets
 
     def _read_toc(self):
@@ -211,37 +137,105 @@ class DS_Store:
         Returns:
             dict: ToC entries mapping names to block IDs.
         """
-        count = struct.unpack(">I", self.block.offset_read(4))[0]
+        count = _U32.unpack(self.block.offset_read(4))[0]
         toc = {}
 
         for _ in range(count):
-            toc_len = struct.unpack(">B", self.block.offset_read(1))[0]
-            toc_name = self.block.offset_read(toc_len).decode()
-            block_id = struct.unpack(">I", self.block.offset_read(4))[0]
+            toc_len = self.block.offset_read(1)[0]
+            toc_name = bytes(self.block.offset_read(toc_len)).decode()
+            block_id = _U32.unpack(self.block.offset_read(4))[0]
             toc[toc_name] = block_id
 
-        self.logger.info(f"ToC read: {toc}")
+        log.info("ToC read: %s", toc)
         return toc
 
     def traverse(self, block_id):
         """
-        Traverses a block and extracts filenames.
+        Traverses a block and the blocks chained after it, yielding filenames.
+        A filename is yielded only the first time it is seen.
 
         Args:
             block_id (int): ID of the block to traverse.
 
-        Returns:
-            list: List of filenames.
+        Yields:
+            str: Unique filenames in traversal order.
+        """
+        stack = [block_id]
+        visited = set()
+        seen = set()
+
+        while stack:
+            block_id = stack.pop()
+            if block_id in visited:
+                # A malformed file may chain blocks into a cycle
+                continue
+            visited.add(block_id)
+
+            node = self._block_by_id(block_id)
+            next_pointer, count = struct.unpack(">II", node.offset_read(8))
+
+            for filename in self._iter_filenames(node, count):
+                if filename in seen:
+                    continue
+                seen.add(filename)
+                yield filename
+
+            if next_pointer > 0:
+                stack.append(next_pointer)
+
+    def _iter_filenames(self, node, count):
         """
-        node = self._block_by_id(block_id)
-        next_pointer, count = struct.unpack(">II", node.offset_read(8))
+        Parses the filename records of a node in a single linear pass.
+
+        Args:
+            node (DataBlock): Node block positioned at its first record.
+            count (int): Number of records in the node.
+
+        Yields:
+            str: Filenames in record order.
 
-        filenames = [node.read_filename() for _ in range(count)]
+        Raises:
+            ParsingError: If a record runs past the end of the node.
+        """
+        data = node.data
+        pos = node.pos
+        debug = log.isEnabledFor(logging.DEBUG)
+
+        try:
+            for _ in range(count):
+                length = _U32.unpack_from(data, pos)[0]
+                name_start = pos + 4
+                name_end = name_start + length * 2
+                structure_id, structure_type = _FILENAME_TAIL.unpack_from(data, name_end)
+                filename = bytes(data[name_start:name_end]).decode("utf-16be")
+                pos = name_end + _FILENAME_TAIL.size
+
+                if structure_type == b"blob":
+                    pos += 4 + _U32.unpack_from(data, pos)[0]
+                else:
+                    pos += _SKIP_LENGTHS.get(structure_type, 0)
+
+                if debug:
+                    log.debug(
+                        "Filename: %s, Structure ID: %d, Type: %s",
+                        filename,
+                        structure_id,
+                        structure_type.decode(errors="replace"),
+                    )
+                yield filename
+        except struct.error:
+            raise ParsingError("Requested length exceeds available data size.")
+        finally:
+            node.pos = pos
 
-        if next_pointer > 0:
-            filenames += self.traverse(next_pointer)
+    def traverse_root(self):
+        """
+        Traverses the tree from the root DSDB block.
 
-        return filenames
+        Returns:
+            generator: Unique filenames in traversal order.
+        """
+        return self.traverse(self.toc["DSDB"])
 
     def _block_by_id(self, block_id):
         """
@@ -260,13 +254,14 @@ class DS_Store:
         offset = addr & ~0x1F
         size = 1 << (addr & 0x1F)
 
-        return DataBlock(self.block.offset_read(size, offset + 4), debug=self.logger.enable_debug)
+        return DataBlock(self.block.offset_read(size, offset + 4))
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="[%(levelname)s] %(message)s")
     with open(".DS_Store", "rb") as f:
         data = f.read()
 
-    parser = DS_Store(data, debug=True)
-    filenames = parser.traverse(parser.toc["DSDB"])
+    parser = DS_Store(data)
+    filenames = list(parser.traverse_root())
     print("Extracted filenames:", filenames)
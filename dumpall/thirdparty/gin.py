@@ -3,13 +3,14 @@
 gin - a Git index file parser with enhanced functionality
 """
 
-import binascii
 import collections
 import json
+import logging
 import mmap
 import struct
 import argparse
 import os
+import stat
 import sys
 from typing import Generator, OrderedDict
 
@@ -17,6 +18,15 @@ from typing import Generator, OrderedDict
 # Global version
 VERSION = "0.2.001"
 
+log = logging.getLogger(__name__)
+
+# Pre-compiled struct formats
+_U32 = struct.Struct("!I")
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size
+_ENTRY_FIXED = struct.Struct("!10I")
+_SHA1_FLAGS = struct.Struct("!20sH")
+_EXT_HEADER = struct.Struct("!4sI")  # signature, size
+
 
 class ParsingError(Exception):
     """Custom exception for errors encountered during parsing."""
@@ -31,66 +41,68 @@ class GitIndexParser:
     def __init__(self, filename: str, pretty: bool = True):
         self.filename = filename
         self.pretty = pretty
-        self.logger = Logger(enable_debug=True)
 
     def parse(self) -> Generator[OrderedDict, None, None]:
         """Main parsing logic for Git index files."""
         with open(self.filename, "rb") as o:
             f = mmap.mmap(o.fileno(), 0, access=mmap.ACCESS_READ)
 
-            def read(format: str):
-                """Read bytes using the given struct format."""
-                format = "!" + format
-                bytes = f.read(struct.calcsize(format))
-                return struct.unpack(format, bytes)[0]
-
             # Parse header
             index = collections.OrderedDict()
             index["signature"] = f.read(4).decode("ascii")
-            self.logger.check(index["signature"] == "DIRC", "Not a Git index file.")
+            _check(index["signature"] == "DIRC", "Not a Git index file.")
 
-            index["version"] = read("I")
-            self.logger.check(
+            index["version"] = _U32.unpack(f.read(4))[0]
+            _check(
                 index["version"] in {2, 3},
                 f"Unsupported version: {index['version']}",
             )
 
-            index["entries"] = read("I")
-            self.logger.info(f"Parsed header: {index}")
+            index["entries"] = _U32.unpack(f.read(4))[0]
+            log.info("Parsed header: %s", index)
             yield index
 
             # Parse entries
             for n in range(index["entries"]):
-                entry = self._parse_entry(f, read, n + 1)
+                entry = self._parse_entry(f, n + 1)
                 yield entry
 
-            # Parse extensions
-            while f.tell() < (len(f) - 20):
-                extension = self._parse_extension(f, read)
+            # Parse extensions, tracking the offset locally instead of via tell()
+            size = len(f)
+            end = size - 20
+            pos = f.tell()
+            while pos < end:
+                extension, pos = self._parse_extension(f, pos)
                 yield extension
+            f.seek(min(pos, size))
 
             # Parse checksum
             checksum = self._parse_checksum(f)
             yield checksum
 
-    def _parse_entry(self, f, read, entry_number):
+    def _parse_entry(self, f, entry_number):
         """Parses a single entry."""
+        (
+            ctime_s, ctime_ns, mtime_s, mtime_ns, dev, ino, mode, uid, gid, size
+        ) = _ENTRY_FIXED.unpack(f.read(_ENTRY_FIXED.size))
+        sha1, flags = _SHA1_FLAGS.unpack(f.read(_SHA1_FLAGS.size))
+
         entry = collections.OrderedDict()
         entry["entry"] = entry_number
-        entry["ctime_seconds"] = read("I")
-        entry["ctime_nanoseconds"] = read("I")
-        entry["mtime_seconds"] = read("I")
-        entry["mtime_nanoseconds"] = read("I")
-        entry["dev"] = read("I")
-        entry["ino"] = read("I")
-        entry["mode"] = f"{read('I'):06o}"
-        entry["uid"] = read("I")
-        entry["gid"] = read("I")
-        entry["size"] = read("I")
-        entry["sha1"] = binascii.hexlify(f.read(20)).decode("ascii")
-        entry["flags"] = read("H")
+        entry["ctime_seconds"] = ctime_s
+        entry["ctime_nanoseconds"] = ctime_ns
+        entry["mtime_seconds"] = mtime_s
+        entry["mtime_nanoseconds"] = mtime_ns
+        entry["dev"] = dev
+        entry["ino"] = ino
+        entry["mode"] = f"{mode:06o}"
+        entry["uid"] = uid
+        entry["gid"] = gid
+        entry["size"] = size
+        entry["sha1"] = sha1.hex()
+        entry["flags"] = flags
         entry["name"] = self._read_name(f, entry["flags"])
-        self.logger.debug(f"Parsed entry: {entry}")
+        log.debug("Parsed entry: %s", entry)
         return entry
 
     def _read_name(self, f, flags):
@@ -98,56 +110,64 @@ class GitIndexParser:
         namelen = flags & 0xFFF
         if namelen < 0xFFF:
             return f.read(namelen).decode("utf-8", "replace")
-        name = []
-        while (byte := f.read(1)) != b"\x00":
-            name.append(byte)
-        return b"".join(name).decode("utf-8", "replace")
-
-    def _parse_extension(self, f, read):
-        """Parses an extension block."""
+        # Long names are NUL-terminated; let mmap.find scan for the terminator
+        start = f.tell()
+        nul = f.find(b"\x00", start)
+        if nul < 0:
+            raise ParsingError("Unterminated entry name.")
+        name = f[start:nul]
+        f.seek(nul + 1)
+        return name.decode("utf-8", "replace")
+
+    def _parse_extension(self, f, pos):
+        """Parses an extension block at pos and returns it with the next offset."""
+        signature, size = _EXT_HEADER.unpack_from(f, pos)
+        pos += _EXT_HEADER.size
         extension = collections.OrderedDict()
-        extension["signature"] = f.read(4).decode("ascii")
-        extension["size"] = read("I")
-        extension["data"] = f.read(extension["size"]).decode("utf-8", "replace")
-        self.logger.info(f"Parsed extension: {extension}")
-        return extension
+        extension["signature"] = signature.decode("ascii")
+        extension["size"] = size
+        # Extension payloads (TREE, REUC, ...) are binary; keep the raw bytes
+        extension["data"] = f[pos:pos + size]
+        log.info(
+            "Parsed extension: %s (%d bytes)", extension["signature"], extension["size"]
+        )
+        return extension, pos + size
 
     def _parse_checksum(self, f):
         """Parses the checksum."""
         checksum = collections.OrderedDict()
         checksum["checksum"] = True
-        checksum["sha1"] = binascii.hexlify(f.read(20)).decode("ascii")
-        self.logger.info(f"Parsed checksum: {checksum}")
+        checksum["sha1"] = f.read(20).hex()
+        log.info("Parsed checksum: %s", checksum)
         return checksum
 
 
-class Logger:
-    """Simple logging utility."""
-
-    def __init__(self, enable_debug=False):
-        self.enable_debug = enable_debug
-
-    def debug(self, message):
-        if self.enable_debug:
-            print(f"[DEBUG] {message}")
+def _check(condition, message):
+    """Logs an error and exits if the condition does not hold."""
+    if not condition:
+        log.error(message)
+        sys.exit(1)
 
-    def info(self, message):
-        print(f"[INFO] {message}")
 
-    def check(self, condition, message):
-        if not condition:
-            print(f"[ERROR] {message}", file=sys.stderr)
-            sys.exit(1)
+def _json_default(obj):
+    """Encodes raw extension payloads as hex for JSON output."""
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.hex()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
-def parse_file(arg, pretty=True):
-    """Parses a Git index file and outputs the results."""
+def parse_file(arg, pretty=True, batch_size=1024):
+    """Parses a Git index file and outputs the results in batches."""
     parser = GitIndexParser(arg, pretty)
+    dump_kwargs = {"indent": 2} if pretty else {"separators": (",", ":")}
+    parts = []
     for item in parser.parse():
-        if pretty:
-            print(json.dumps(item, indent=2))
-        else:
-            print(json.dumps(item))
+        parts.append(json.dumps(item, default=_json_default, **dump_kwargs))
+        if len(parts) >= batch_size:
+            sys.stdout.write("\n".join(parts) + "\n")
+            parts.clear()
+    if parts:
+        sys.stdout.write("\n".join(parts) + "\n")
 
 
 def main():
@@ -161,17 +181,23 @@ def main():
         "path", nargs="?", default=".", help="Path to a Git repository or index file."
     )
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 
     if args.version:
         print(f"gin {VERSION}")
         sys.exit()
 
     path = args.path
-    if os.path.isdir(path):
-        path = os.path.join(path, ".git", "index")
-        if not os.path.isfile(path):
-            print("Error: Could not find .git/index file.", file=sys.stderr)
-            sys.exit(1)
+    try:
+        st = os.stat(path)
+        if stat.S_ISDIR(st.st_mode):
+            path = os.path.join(path, ".git", "index")
+            st = os.stat(path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        print(f"Error: Could not find {path} file.", file=sys.stderr)
+        sys.exit(1)
 
     parse_file(path, pretty=not args.json)
 
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding=utf-8 -*-
+
+import asyncio
+import logging
+import os
+import posixpath
+import tempfile
+import unittest
+from unittest import mock
+
+import click
+
+from dumpall.addons import dsdumper
+from .utils import build_ds_store
+
+
+class FakeDumper(dsdumper.Dumper):
+    """ 不联网的 Dumper，只有根目录存在 .DS_Store """
+
+    ds_data = build_ds_store(["a.txt", "../pwned"])
+
+    async def fetch(self, url, times=3):
+        if url == self.base_url + "/.DS_Store":
+            return 200, self.ds_data
+        return 404, None
+
+    async def download(self, target):
+        self.downloaded.append(target)
+
+
+class NormalizingDumper(FakeDumper):
+    """ 像服务端一样折叠路径中的 . 和 ..，根目录的 .DS_Store 包含 . 和 .. 记录 """
+
+    ds_data = build_ds_store([".", "..", "a.txt"])
+    max_fetches = 50
+
+    async def fetch(self, url, times=3):
+        self.fetched.append(url)
+        if len(self.fetched) > self.max_fetches:
+            raise RuntimeError("crawl did not terminate")
+        path = posixpath.normpath(url[len("http://example.com"):])
+        if path == "/.DS_Store":
+            return 200, self.ds_data
+        return 404, None
+
+
+class TestDsDumper(unittest.TestCase):
+    def test_skips_entries_outside_outdir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            outdir = os.path.join(tmp, "out")
+            os.makedirs(outdir)
+            dumper = FakeDumper("http://example.com/.DS_Store", outdir)
+            dumper.downloaded = []
+            # 对蜜罐提示选择“否”
+            with mock.patch.object(click, "confirm", side_effect=click.Abort()):
+                asyncio.run(dumper.start())
+
+        self.assertEqual(dumper.targets, [("http://example.com/a.txt", "a.txt")])
+        self.assertEqual(dumper.downloaded, dumper.targets)
+
+    def test_missing_ds_store_is_not_a_failure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dumper = FakeDumper("http://example.com/.DS_Store", tmp)
+            dumper.ds_data = build_ds_store(["a.txt"])
+            dumper.downloaded = []
+            with self.assertLogs(dsdumper.log, level="DEBUG") as logs:
+                asyncio.run(dumper.start())
+
+        # a.txt/.DS_Store 返回 404，只记录调试日志
+        self.assertEqual(dumper.failed_urls, [])
+        self.assertFalse([r for r in logs.records if r.levelno >= logging.WARNING])
+
+    def test_fetch_error_is_a_failure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dumper = FakeDumper("http://example.com/.DS_Store", tmp)
+
+            async def fetch(url, times=3):
+                return 0, None
+
+            dumper.fetch = fetch
+            dumper.downloaded = []
+            asyncio.run(dumper.start())
+
+        self.assertEqual(dumper.failed_urls, ["http://example.com"])
+
+    def _run_normalizing(self, force):
+        with tempfile.TemporaryDirectory() as tmp:
+            dumper = NormalizingDumper("http://example.com/.DS_Store", tmp, force=force)
+            dumper.downloaded = []
+            dumper.fetched = []
+            asyncio.run(dumper.start())
+        return dumper
+
+    def test_dot_entries_do_not_loop(self):
+        for force in (False, True):
+            with self.subTest(force=force):
+                dumper = self._run_normalizing(force)
+                self.assertEqual(
+                    dumper.fetched,
+                    [
+                        "http://example.com/.DS_Store",
+                        "http://example.com/a.txt/.DS_Store",
+                    ],
+                )
+                self.assertEqual(
+                    dumper.targets, [("http://example.com/a.txt", "a.txt")]
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding=utf-8 -*-
+
+import struct
+import unittest
+
+from dumpall.thirdparty import dsstore
+from .utils import build_nodes, record
+
+
+class TestDsStore(unittest.TestCase):
+    def parse(self, nodes):
+        return list(dsstore.DS_Store(build_nodes(nodes)).traverse_root())
+
+    def test_record_types(self):
+        records = [
+            record("flag", b"bool", b"\x01"),
+            record("number", b"long", struct.pack(">I", 7)),
+            record("payload", b"blob", struct.pack(">I", 5) + b"\x00\xffbin"),
+            record("unknown", b"type", b""),
+            record("last.txt"),
+        ]
+        self.assertEqual(
+            self.parse([(0, records)]),
+            ["flag", "number", "payload", "unknown", "last.txt"],
+        )
+
+    def test_chained_blocks(self):
+        nodes = [
+            (2, [record("a.txt"), record("b.txt")]),
+            (0, [record("c.txt"), record("a.txt")]),
+        ]
+        self.assertEqual(self.parse(nodes), ["a.txt", "b.txt", "c.txt"])
+
+    def test_self_referencing_block_terminates(self):
+        self.assertEqual(self.parse([(1, [record("a.txt")])]), ["a.txt"])
+
+    def test_cyclic_chain_terminates(self):
+        nodes = [(2, [record("a.txt")]), (1, [record("b.txt")])]
+        self.assertEqual(self.parse(nodes), ["a.txt", "b.txt"])
+
+    def test_truncated_record(self):
+        # 文件名长度超出节点剩余数据
+        truncated = struct.pack(">I", 0xFFFF) + "a".encode("utf-16be")
+        with self.assertRaises(dsstore.ParsingError):
+            self.parse([(0, [record("ok.txt"), truncated])])
+
+    def test_invalid_next_pointer(self):
+        with self.assertRaises(dsstore.ParsingError):
+            self.parse([(9, [record("a.txt")])])
+
+
+if __name__ == "__main__":
+    unittest.main()
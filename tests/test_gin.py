@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding=utf-8 -*-
+
+import contextlib
+import io
+import json
+import mmap
+import os
+import struct
+import tempfile
+import unittest
+
+from dumpall.thirdparty import gin
+
+CHECKSUM = bytes(range(20))
+
+
+def extension(signature, data):
+    return signature + struct.pack("!I", len(data)) + data
+
+
+class TestGin(unittest.TestCase):
+    def write_index(self, body):
+        """ 写入一个没有条目的 index 文件，body 为扩展及校验和部分 """
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"DIRC" + struct.pack("!II", 2, 0) + body)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_extensions_and_checksum(self):
+        path = self.write_index(
+            extension(b"TREE", b"ab\x00\xffe") + extension(b"REUC", b"") + CHECKSUM
+        )
+        items = list(gin.GitIndexParser(path).parse())
+
+        self.assertEqual(items[0]["entries"], 0)
+        self.assertEqual(
+            [(i["signature"], i["size"], i["data"]) for i in items[1:3]],
+            [("TREE", 5, b"ab\x00\xffe"), ("REUC", 0, b"")],
+        )
+        self.assertEqual(items[3]["sha1"], CHECKSUM.hex())
+
+    def test_oversized_extension_is_clamped(self):
+        # 扩展声明的长度超出文件末尾，不应越界 seek
+        path = self.write_index(b"TREE" + struct.pack("!I", 1000) + CHECKSUM)
+        items = list(gin.GitIndexParser(path).parse())
+
+        self.assertEqual(items[1]["data"], CHECKSUM)
+        self.assertEqual(items[2]["sha1"], "")
+
+    def test_json_output_hex_encodes_extension_data(self):
+        path = self.write_index(extension(b"TREE", b"\x00\xff") + CHECKSUM)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            gin.parse_file(path, pretty=False)
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(lines[1], {"signature": "TREE", "size": 2, "data": "00ff"})
+        self.assertEqual(lines[2], {"checksum": True, "sha1": CHECKSUM.hex()})
+
+    def read_name(self, data, flags):
+        buf = mmap.mmap(-1, len(data))
+        self.addCleanup(buf.close)
+        buf.write(data)
+        buf.seek(0)
+        return gin.GitIndexParser("index")._read_name(buf, flags), buf.tell()
+
+    def test_short_name(self):
+        self.assertEqual(self.read_name(b"a.txtrest", 5), ("a.txt", 5))
+
+    def test_long_name(self):
+        name = "d" * 5000 + "/f.txt"
+        data = name.encode() + b"\x00rest"
+        self.assertEqual(self.read_name(data, 0xFFF), (name, len(name) + 1))
+
+    def test_long_name_without_terminator(self):
+        with self.assertRaises(gin.ParsingError):
+            self.read_name(b"d" * 5000, 0xFFF)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding=utf-8 -*-
+
+""" 测试用 .DS_Store 构造工具 """
+
+import struct
+
+
+def record(name, structure_type=b"bool", value=b"\x01"):
+    """ 构造一条文件名记录，value 为记录值的原始字节 """
+    return (
+        struct.pack(">I", len(name))
+        + name.encode("utf-16be")
+        + struct.pack(">I", 0)
+        + structure_type
+        + value
+    )
+
+
+def build_nodes(nodes):
+    """
+    构造 .DS_Store 数据，nodes 为 (next_pointer, [record, ...]) 列表，
+    第 i 个节点的块 ID 为 i + 1，根目录 DSDB 指向块 1
+    """
+    blocks = [
+        struct.pack(">II", next_pointer, len(records)) + b"".join(records)
+        for next_pointer, records in nodes
+    ]
+
+    def alloc(size):
+        return 1 << max(5, (size - 1).bit_length())
+
+    # 根块位于偏移 32（文件中 36），之后依次放置节点块
+    root_len = 8 + 4 * (len(blocks) + 1) + 4 + 1 + 4 + 4
+    root_size = alloc(root_len)
+    addrs = [32 | (root_size.bit_length() - 1)]
+    pos = 32 + root_size
+    layout = []
+    for block in blocks:
+        size = alloc(len(block))
+        addrs.append(pos | (size.bit_length() - 1))
+        layout.append((pos, block))
+        pos += size
+
+    root = struct.pack(">II", len(addrs), 0)
+    root += struct.pack(">%dI" % len(addrs), *addrs)
+    root += struct.pack(">IB", 1, 4) + b"DSDB" + struct.pack(">I", 1)
+
+    data = bytearray(pos + 4)
+    data[0:20] = struct.pack(">IIIII", 1, 0x42756431, 32, root_size, 32)
+    data[36:36 + len(root)] = root
+    for offset, block in layout:
+        data[offset + 4:offset + 4 + len(block)] = block
+    return bytes(data)
+
+
+def build_ds_store(filenames):
+    """ 构造只有一个节点的 .DS_Store，每个文件名一条 bool 记录 """
+    return build_nodes([(0, [record(name) for name in filenames])])